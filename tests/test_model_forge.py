@@ -7,6 +7,7 @@ from sqlalchemy import (
     MetaData,
     Table,
     Column,
+    Float,
     Integer,
     String,
     ForeignKey,
@@ -16,10 +17,12 @@ from model_forge import (
     camel_case,
     generate_model,
     is_association_table,
+    find_association_tables,
     generate_relationships,
     generate_many_to_many_relationships,
     generate_models_content,
     output_models,
+    write_models,
 )
 
 
@@ -67,6 +70,9 @@ def test_get_column_type():
     assert get_column_type({"type": "INTEGER"}) == Integer
     assert get_column_type({"type": "VARCHAR"}) == String
     assert get_column_type({"type": "UNKNOWN"}) == String
+    assert get_column_type({"type": "ENUM('date','integer')"}) == Integer
+    assert get_column_type({"type": "DATE_REAL"}) == Float
+    assert get_column_type({"type": "TEXT_INTEGER"}) == Integer
 
 
 def test_camel_case():
@@ -111,6 +117,51 @@ def test_is_association_table(setup_database):
     )
 
 
+def test_is_association_table_column_mismatch(db_url):
+    engine = create_engine(db_url)
+    metadata = MetaData()
+    Table("posts", metadata, Column("id", Integer, primary_key=True))
+    Table("tags", metadata, Column("id", Integer, primary_key=True))
+    Table(
+        "post_tag_versions",
+        metadata,
+        Column("post_id", Integer, ForeignKey("posts.id"), primary_key=True),
+        Column("tag_id", Integer, ForeignKey("tags.id"), primary_key=True),
+        Column("version", Integer, primary_key=True),
+    )
+    Table(
+        "post_tag_aliases",
+        metadata,
+        Column(
+            "id",
+            Integer,
+            ForeignKey("posts.id"),
+            ForeignKey("tags.id"),
+            primary_key=True,
+        ),
+    )
+    metadata.create_all(engine)
+    inspector = inspect(engine.connect())
+    assert not is_association_table(
+        "post_tag_versions",
+        inspector.get_foreign_keys("post_tag_versions"),
+        inspector,
+    )
+    assert not is_association_table(
+        "post_tag_aliases",
+        inspector.get_foreign_keys("post_tag_aliases"),
+        inspector,
+    )
+
+
+def test_find_association_tables(setup_database):
+    connection = setup_database
+    inspector = inspect(connection)
+    assert find_association_tables(inspector) == {
+        "post_tags": ("posts", "tags")
+    }
+
+
 def test_generate_relationships(setup_database):
     connection = setup_database
     inspector = inspect(connection)
@@ -150,6 +201,21 @@ def test_generate_models_content(setup_database):
     assert "post_tags = Table(" in content
 
 
+def test_generate_models_content_reflects_each_table_once(setup_database):
+    connection = setup_database
+    inspector = inspect(connection)
+    calls = []
+    get_foreign_keys = inspector.get_foreign_keys
+
+    def counting_get_foreign_keys(table_name):
+        calls.append(table_name)
+        return get_foreign_keys(table_name)
+
+    inspector.get_foreign_keys = counting_get_foreign_keys
+    generate_models_content(inspector)
+    assert sorted(calls) == sorted(inspector.get_table_names())
+
+
 def test_output_models_to_stdout(setup_database):
     output = io.StringIO()
     stderr = io.StringIO()
@@ -170,5 +236,52 @@ def test_output_models_to_stdout(setup_database):
     assert "Models have been printed to stdout" in stderr_content
 
 
+def test_output_models_to_file(setup_database, tmp_path):
+    connection = setup_database
+    inspector = inspect(connection)
+    content = generate_models_content(inspector)
+    output_file = tmp_path / "models.py"
+    stdout = io.StringIO()
+
+    with redirect_stdout(stdout):
+        output_models(content, output_file)
+
+    assert output_file.read_text() == content
+    assert f"Models have been written to {output_file}" in stdout.getvalue()
+
+
+def test_write_models(setup_database, tmp_path):
+    connection = setup_database
+    inspector = inspect(connection)
+    output_file = tmp_path / "models.py"
+    output_file.write_text("previous models\n")
+    output_file.chmod(0o640)
+    stdout = io.StringIO()
+
+    with redirect_stdout(stdout):
+        write_models(inspector, output_file)
+
+    assert output_file.read_text() == generate_models_content(inspector)
+    assert output_file.stat().st_mode & 0o777 == 0o640
+    assert f"Models have been written to {output_file}" in stdout.getvalue()
+
+
+def test_write_models_keeps_previous_file_on_error(setup_database, tmp_path):
+    connection = setup_database
+    inspector = inspect(connection)
+    output_file = tmp_path / "models.py"
+    output_file.write_text("previous models\n")
+
+    def failing_get_columns(table_name):
+        raise RuntimeError("reflection failed")
+
+    inspector.get_columns = failing_get_columns
+    with pytest.raises(RuntimeError):
+        write_models(inspector, output_file)
+
+    assert output_file.read_text() == "previous models\n"
+    assert list(tmp_path.iterdir()) == [output_file]
+
+
 if __name__ == "__main__":
     pytest.main()